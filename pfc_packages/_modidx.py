@@ -5,12 +5,29 @@ d = { 'settings': { 'branch': 'main',
                 'doc_host': 'https://Matheus-lla.github.io',
                 'git_url': 'https://github.com/Matheus-lla/pfc-semantic-segmentation',
                 'lib_path': 'pfc_packages'},
-  'syms': { 'pfc_packages.gpf_slr': { 'pfc_packages.gpf_slr.estimate_ground_plane': ( 'gpf_slr.html#estimate_ground_plane',
+  'syms': { 'pfc_packages.gpf_slr': { 'pfc_packages.gpf_slr.PointCloud': ('gpf_slr.html#pointcloud', 'pfc_packages/gpf_slr.py'),
+                                      'pfc_packages.gpf_slr.PointCloud.__getitem__': ( 'gpf_slr.html#pointcloud.__getitem__',
+                                                                                       'pfc_packages/gpf_slr.py'),
+                                      'pfc_packages.gpf_slr.PointCloud.__len__': ( 'gpf_slr.html#pointcloud.__len__',
+                                                                                   'pfc_packages/gpf_slr.py'),
+                                      'pfc_packages.gpf_slr.PointCloud.from_array': ( 'gpf_slr.html#pointcloud.from_array',
+                                                                                      'pfc_packages/gpf_slr.py'),
+                                      'pfc_packages.gpf_slr.PointCloud.to_array': ( 'gpf_slr.html#pointcloud.to_array',
+                                                                                    'pfc_packages/gpf_slr.py'),
+                                      'pfc_packages.gpf_slr._find_run_breaks': ('gpf_slr.html#_find_run_breaks', 'pfc_packages/gpf_slr.py'),
+                                      'pfc_packages.gpf_slr._resolve_label': ('gpf_slr.html#_resolve_label', 'pfc_packages/gpf_slr.py'),
+                                      'pfc_packages.gpf_slr._resolve_label_table': ( 'gpf_slr.html#_resolve_label_table',
+                                                                                     'pfc_packages/gpf_slr.py'),
+                                      'pfc_packages.gpf_slr._squared_distance_3d': ( 'gpf_slr.html#_squared_distance_3d',
+                                                                                     'pfc_packages/gpf_slr.py'),
+                                      'pfc_packages.gpf_slr.estimate_ground_plane': ( 'gpf_slr.html#estimate_ground_plane',
                                                                                       'pfc_packages/gpf_slr.py'),
                                       'pfc_packages.gpf_slr.extract_clusters': ('gpf_slr.html#extract_clusters', 'pfc_packages/gpf_slr.py'),
                                       'pfc_packages.gpf_slr.extract_initial_seed_indices': ( 'gpf_slr.html#extract_initial_seed_indices',
                                                                                              'pfc_packages/gpf_slr.py'),
                                       'pfc_packages.gpf_slr.find_runs': ('gpf_slr.html#find_runs', 'pfc_packages/gpf_slr.py'),
+                                      'pfc_packages.gpf_slr.find_scanline_neighbors': ( 'gpf_slr.html#find_scanline_neighbors',
+                                                                                        'pfc_packages/gpf_slr.py'),
                                       'pfc_packages.gpf_slr.group_by_scanline': ( 'gpf_slr.html#group_by_scanline',
                                                                                   'pfc_packages/gpf_slr.py'),
                                       'pfc_packages.gpf_slr.refine_ground_plane': ( 'gpf_slr.html#refine_ground_plane',
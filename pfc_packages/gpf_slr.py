@@ -1,22 +1,81 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/01_gpf_slr.ipynb.
 
 # %% auto 0
-__all__ = ['extract_initial_seed_indices', 'estimate_ground_plane', 'refine_ground_plane', 'group_by_scanline', 'find_runs',
-           'update_labels', 'extract_clusters', 'scan_line_run_clustering']
+__all__ = ['PointCloud', 'extract_initial_seed_indices', 'estimate_ground_plane', 'refine_ground_plane', 'group_by_scanline',
+           'find_runs', 'find_scanline_neighbors', 'update_labels', 'extract_clusters', 'scan_line_run_clustering']
 
 # %% ../nbs/01_gpf_slr.ipynb 3
+from dataclasses import dataclass
+
 import numpy as np
-from sklearn.neighbors import KDTree
+from numba import njit
+from scipy.spatial import cKDTree
 
 # %% ../nbs/01_gpf_slr.ipynb 5
+@dataclass
+class PointCloud:
+    """
+    Point cloud stored as one typed array per attribute (structure of arrays).
+
+    Attributes:
+        xyz (np.ndarray): N x 3 float32 contiguous array of points (x, y, z).
+        true_label (np.ndarray): N int32 array of ground truth labels.
+        pred_label (np.ndarray): N int32 array of predicted labels.
+        scan_id (np.ndarray): N int16 array of scanline indices.
+    """
+
+    xyz: np.ndarray
+    true_label: np.ndarray
+    pred_label: np.ndarray
+    scan_id: np.ndarray
+
+    @classmethod
+    def from_array(
+        cls, point_cloud: np.ndarray, indices: "np.ndarray | None" = None
+    ) -> "PointCloud":
+        """
+        Build a PointCloud from an N x 6 array [x, y, z, true_label, pred_label, scanline_id].
+
+        If `indices` is given, only those rows are taken, gathering each column directly
+        instead of copying the selected N x 6 rows first.
+        """
+        rows = slice(None) if indices is None else indices
+        return cls(
+            xyz=np.ascontiguousarray(point_cloud[rows, :3], dtype=np.float32),
+            true_label=point_cloud[rows, 3].astype(np.int32),
+            pred_label=point_cloud[rows, 4].astype(np.int32),
+            scan_id=point_cloud[rows, 5].astype(np.int16),
+        )
+
+    def to_array(self) -> np.ndarray:
+        """
+        Return the N x 6 float64 array [x, y, z, true_label, pred_label, scanline_id].
+        """
+        return np.column_stack(
+            (self.xyz, self.true_label, self.pred_label, self.scan_id)
+        ).astype(np.float64)
+
+    def __len__(self) -> int:
+        return len(self.xyz)
+
+    def __getitem__(self, index) -> "PointCloud":
+        """Select a subset of points (slices return views, index arrays and masks return copies)."""
+        return PointCloud(
+            self.xyz[index],
+            self.true_label[index],
+            self.pred_label[index],
+            self.scan_id[index],
+        )
+
+# %% ../nbs/01_gpf_slr.ipynb 7
 def extract_initial_seed_indices(
-    point_cloud: np.ndarray, num_points: int = 1000, height_threshold: float = 0.4
+    xyz: np.ndarray, num_points: int = 1000, height_threshold: float = 0.4
 ) -> np.ndarray:
     """
     Extract initial seed points for ground plane estimation (GPF).
 
     Args:
-        point_cloud (np.ndarray): N x 3 array of points (x, y, z).
+        xyz (np.ndarray): N x 3 array of points (x, y, z).
         num_points (int): number of lowest Z points to average as LPR.
         height_threshold (float): threshold to select seeds close to LPR height.
 
@@ -24,21 +83,23 @@ def extract_initial_seed_indices(
         seeds_ids (np.ndarray): indices of points selected as initial seeds.
     """
 
-    # Step 1: Sort the point cloud by Z axis (height)
-    sorted_indices = np.argsort(point_cloud[:, 2])  # Get indices sorted by height
-    sorted_points = point_cloud[sorted_indices]  # Apply sorting
+    z = xyz[:, 2]
+    num_points = min(num_points, len(z))
+
+    # Step 1: Partially sort the Z axis (height) to find the lowest points, no full sort needed
+    lowest_indices = np.argpartition(z, num_points - 1)[:num_points]
 
     # Step 2: Compute LPR (Lowest Point Representative)
-    lpr_height = np.mean(sorted_points[:num_points, 2])
+    lpr_height = np.mean(z[lowest_indices])
 
     # Step 3: Select point ids that are within threshold distance from LPR
-    mask = sorted_points[:, 2] < (lpr_height + height_threshold)
-    return sorted_indices[mask]
+    mask = z < (lpr_height + height_threshold)
+    return np.nonzero(mask)[0]
 
-# %% ../nbs/01_gpf_slr.ipynb 6
+# %% ../nbs/01_gpf_slr.ipynb 8
 def estimate_ground_plane(points: np.ndarray) -> "tuple[np.ndarray, float]":
     """
-    Estimate the ground plane parameters using Singular Value Decomposition (SVD).
+    Estimate the ground plane parameters using the eigen decomposition of the seed covariance.
 
     Args:
         points (np.ndarray): N x 3 array (x, y, z) of seed points assumed to be on or near the ground.
@@ -53,28 +114,29 @@ def estimate_ground_plane(points: np.ndarray) -> "tuple[np.ndarray, float]":
     centroid = np.mean(points, axis=0)
     centered_points = points - centroid
 
-    # Step 2: Compute the covariance matrix of centered points
-    covariance_matrix = np.cov(centered_points.T)
+    # Step 2: Compute the (unscaled) covariance matrix of centered points as a single Gram product;
+    # scaling by 1 / (n - 1) does not change the eigenvectors, so it is skipped
+    covariance_matrix = centered_points.T @ centered_points
 
-    # Step 3: Perform SVD on the covariance matrix to extract principal directions
-    _, _, vh = np.linalg.svd(covariance_matrix)
+    # Step 3: Covariance is symmetric, so eigh extracts the principal directions
+    _, eigenvectors = np.linalg.eigh(covariance_matrix)
 
-    # Step 4: Normal vector is the direction with smallest variance (last column of V^T)
-    normal = vh[-1]
+    # Step 4: Normal vector is the direction with smallest variance (eigh sorts eigenvalues ascending)
+    normal = eigenvectors[:, 0]
 
     # Step 5: Compute plane bias using point-normal form: ax + by + cz + d = 0
     d = -np.dot(normal, centroid)
 
     return (normal, d)
 
-# %% ../nbs/01_gpf_slr.ipynb 7
+# %% ../nbs/01_gpf_slr.ipynb 9
 def refine_ground_plane(
     point_cloud: np.ndarray,
     num_points: int = 1000,
     height_threshold: float = 0.4,
     distance_threshold: float = 0.2,
     num_iterations: int = 5,
-) -> "tuple[np.ndarray, tuple[np.ndarray, float]]":
+) -> "tuple[np.ndarray, tuple[np.ndarray, float] | None]":
     """
     Iteratively refine the ground plane estimation using seed points and distance threshold.
 
@@ -83,148 +145,278 @@ def refine_ground_plane(
         num_points (int): Number of lowest Z points used to compute the initial ground seed height (LPR).
         height_threshold (float): Vertical distance threshold from the LPR used to select initial seed points.
         distance_threshold (float): Max allowed point-to-plane distance for a point to be considered ground.
-        num_iterations (int): Number of iterations to refine the plane and ground classification.
+        num_iterations (int): Maximum number of iterations to refine the plane and ground classification,
+                              stopping early once the ground points no longer change.
 
     Returns:
         tuple:
             - point_cloud (np.ndarray): Nx6 array [x, y, z, true_label, pred_label, scanline_id], input array with ground points labeled.
             - normal (np.ndarray): Normal vector (a, b, c) of the estimated ground plane.
             - d (float): Offset term of the estimated plane equation (ax + by + cz + d = 0).
+            If there are fewer than 3 initial seeds no plane can be fitted: the point cloud is returned
+            unlabeled and the plane tuple is None.
     """
 
-    # Step 0: Use only XYZ for plane estimation
-    xyz = point_cloud[:, :3]
+    # Step 0: Use only XYZ for plane estimation, as a contiguous float32 block (same layout as PointCloud.xyz)
+    xyz = np.ascontiguousarray(point_cloud[:, :3], dtype=np.float32)
 
-    # Step 1: Get initial seed points based on lowest Z values
+    # Step 1: Get initial seed points based on lowest Z values, kept as a mask over all points
     seed_indices = extract_initial_seed_indices(xyz, num_points, height_threshold)
+    if len(seed_indices) < 3:
+        return (point_cloud, None)  # degenerate: not enough seeds to define a plane
+    is_ground = np.zeros(len(xyz), dtype=bool)
+    is_ground[seed_indices] = True
+
+    # Buffers reused across iterations for point-to-plane distances and ground classification
+    distances = np.empty(len(xyz), dtype=xyz.dtype)
+    spare_is_ground = np.empty(len(xyz), dtype=bool)
 
     for _ in range(num_iterations):
         # Step 2: Estimate ground plane using current seeds
-        normal, d = estimate_ground_plane(xyz[seed_indices])
+        normal, d = estimate_ground_plane(xyz[is_ground])
 
         # Step 3: Compute distances from all points to the estimated plane
-        distances = np.abs(np.dot(xyz, normal) + d) / np.linalg.norm(normal)
+        # (normal is an eigenvector, hence already unit length)
+        np.matmul(xyz, normal, out=distances)
+        distances += d
+        np.abs(distances, out=distances)
 
-        # Step 4: Classify as ground if within distance threshold
-        is_ground = distances < distance_threshold
+        # Step 4: Classify as ground if within distance threshold; these become the new seeds
+        # (the previous mask is kept for the convergence check and recycled as the next buffer)
+        prev_is_ground = is_ground
+        is_ground = np.less(distances, distance_threshold, out=spare_is_ground)
+        spare_is_ground = prev_is_ground
 
-        # Step 5: Update seeds with newly classified ground points
-        seed_indices = np.where(is_ground)[0]
+        # Step 5: Stop once the seeds are stable (same plane again) or too few to fit a plane
+        if np.count_nonzero(is_ground) < 3 or np.array_equal(is_ground, prev_is_ground):
+            break
 
     # Final ground classification using last iteration's result
-    point_cloud[seed_indices, 4] = 9  # Set label = 9 for ground
+    point_cloud[is_ground, 4] = 9  # Set label = 9 for ground
 
     return (point_cloud, (normal, d))
 
-# %% ../nbs/01_gpf_slr.ipynb 9
-def group_by_scanline(point_cloud: np.ndarray) -> "list[np.ndarray]":
+# %% ../nbs/01_gpf_slr.ipynb 11
+def group_by_scanline(point_cloud: PointCloud) -> "tuple[list[PointCloud], np.ndarray]":
     """
     Group points by their scanline index in a vectorized way.
 
     Args:
-        point_cloud (np.ndarray): N x 6 array [x, y, z, true_label, pred_label, scanline_id].
+        point_cloud (PointCloud): Point cloud to group.
 
     Returns:
-        list[np.ndarray]: List of arrays. Each array contains the points (N_i x 6)
-                          from one scanline, sorted by scanline_id.
+        tuple:
+            - list[PointCloud]: List of point clouds. Each one contains the points (N_i)
+                                from one scanline, sorted by scanline_id and, within
+                                each scanline, by azimuth.
+            - order (np.ndarray): N array with the permutation that sorts the input by scanline_id
+                                  and azimuth, i.e. the concatenated groups equal `point_cloud[order]`.
     """
-    scan_ids = point_cloud[:, 5].astype(int)
-    unique_ids = np.unique(scan_ids)
+    # Sort once by scanline, then by azimuth so consecutive points are neighbors along the ring
+    # (runs in `find_runs` rely on it, and the first and last points close the ring)
+    azimuth = np.arctan2(point_cloud.xyz[:, 1], point_cloud.xyz[:, 0])
+    order = np.lexsort((azimuth, point_cloud.scan_id))
+    sorted_points = point_cloud[order]
 
-    return [point_cloud[scan_ids == s_id] for s_id in unique_ids]
+    # Split wherever the scanline id changes (slices are views of the sorted arrays)
+    split_indices = np.nonzero(np.diff(sorted_points.scan_id))[0] + 1
+    bounds = np.concatenate(([0], split_indices, [len(sorted_points)]))
 
-# %% ../nbs/01_gpf_slr.ipynb 10
+    return ([sorted_points[start:end] for start, end in zip(bounds[:-1], bounds[1:])], order)
+
+# %% ../nbs/01_gpf_slr.ipynb 12
+@njit(cache=True, inline="always")
+def _squared_distance_3d(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Squared euclidean distance between two 3D points, specialized for the fixed dimensionality.
+    """
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    dz = a[2] - b[2]
+    return dx * dx + dy * dy + dz * dz
+
+# %% ../nbs/01_gpf_slr.ipynb 13
+@njit(cache=True)
+def _find_run_breaks(xyz: np.ndarray, squared_threshold: float) -> np.ndarray:
+    """
+    Find where new runs start in a scanline (JIT-compiled).
+
+    Args:
+        xyz (np.ndarray): N x 3 array (x, y, z) of the scanline points.
+        squared_threshold (float): Squared distance threshold between consecutive points.
+
+    Returns:
+        np.ndarray: Positions of the points that start a new run (the first point is omitted).
+    """
+    num_points = xyz.shape[0]
+    breaks = np.empty(num_points, np.int64)
+    num_breaks = 0
+    for i in range(1, num_points):
+        if _squared_distance_3d(xyz[i], xyz[i - 1]) >= squared_threshold:
+            breaks[num_breaks] = i
+            num_breaks += 1
+    return breaks[:num_breaks]
+
+# %% ../nbs/01_gpf_slr.ipynb 14
 def find_runs(
-    scanline_points: np.ndarray, distance_threshold: float = 0.5
+    xyz: np.ndarray, distance_threshold: float = 0.5
 ) -> "list[np.ndarray]":
     """
     Identify runs within a single scanline based on distance between consecutive points.
 
     Args:
-        scanline_points (np.ndarray): N x 6 array [x, y, z, true_label, pred_label, scanline_id].
+        xyz (np.ndarray): N x 3 array (x, y, z) of the scanline points.
         distance_threshold (float): Distance threshold to consider two points part of the same run.
 
     Returns:
-        list[np.ndarray]: List of arrays where each array contains the points of a run.
+        list[np.ndarray]: List of index arrays, each one holding the positions (within the scanline)
+                          of the points of a run.
     """
-    num_points = len(scanline_points)
-    runs = []
-    current_run_indices = [0]  # start with the index of the first point
-
-    for i in range(1, num_points):
-        dist = np.linalg.norm(scanline_points[i, :3] - scanline_points[i - 1, :3])
-        if dist < distance_threshold:
-            current_run_indices.append(i)
-        else:
-            runs.append(scanline_points[current_run_indices])
-            current_run_indices = [i]
+    squared_threshold = distance_threshold**2
 
-    # append the last run
-    runs.append(scanline_points[current_run_indices])
+    # A new run starts wherever consecutive points are too far apart
+    breaks = _find_run_breaks(xyz, squared_threshold)
+    runs = np.split(np.arange(len(xyz)), breaks)
 
     # Check if first and last points are close (circular case)
-    circular_dist = np.linalg.norm(scanline_points[0, :3] - scanline_points[-1, :3])
+    # (three scalar differences: cheaper than any numpy call on two 3-element rows)
+    (x0, y0, z0), (x1, y1, z1) = xyz[0].tolist(), xyz[-1].tolist()
+    circular_dist = (x0 - x1) ** 2 + (y0 - y1) ** 2 + (z0 - z1) ** 2
     # Only merge runs if:
     # - the scanline appears to be circular (first and last points are close), and
     # - there is more than one run (otherwise merging doesn't make sense)
-    if circular_dist < distance_threshold and len(runs) > 1:
+    if circular_dist < squared_threshold and len(runs) > 1:
         # Merge last run with the first
-        runs[0] = np.vstack((runs[-1], runs[0]))
+        runs[0] = np.concatenate((runs[-1], runs[0]))
         runs.pop()
 
     return runs
 
-# %% ../nbs/01_gpf_slr.ipynb 11
+# %% ../nbs/01_gpf_slr.ipynb 15
+def find_scanline_neighbors(
+    xyz_per_scanline: "list[np.ndarray]", merge_threshold: float = 1.0
+) -> "list[np.ndarray]":
+    """
+    Find, for every point, its nearest neighbor in the previous scanline using a single KDTree per frame.
+
+    All scanlines are stacked into one tree with an extra coordinate that places each scanline on its
+    own layer, spaced further apart than `merge_threshold`. Querying a point on the layer of the previous
+    scanline then only matches points of that scanline within the threshold.
+
+    Args:
+        xyz_per_scanline (list[np.ndarray]): List of N_i x 3 arrays (x, y, z) for each scanline.
+        merge_threshold (float): Maximum distance to consider connection between runs.
+
+    Returns:
+        list[np.ndarray]: List of N_i arrays with, for each point, the index of its nearest point in the
+                          previous scanline, or -1 if none is closer than `merge_threshold`.
+                          The first scanline has no previous one, so it is all -1.
+    """
+    sizes = np.array([len(xyz) for xyz in xyz_per_scanline])
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    layer_gap = 2.0 * merge_threshold + 1.0
+
+    first_neighbors = np.full(sizes[0], -1, dtype=np.int64)
+    if len(xyz_per_scanline) == 1:
+        return [first_neighbors]
+
+    # Step 1: Stack x, y, z of all scanlines plus the layer coordinate of each scanline
+    points = np.empty((offsets[-1], 4))
+    points[:, :3] = np.vstack(xyz_per_scanline)
+    points[:, 3] = np.repeat(np.arange(len(xyz_per_scanline)), sizes) * layer_gap
+    tree = cKDTree(points, balanced_tree=False, compact_nodes=False)
+
+    # Step 2: Query every point (but the first scanline's) on the previous scanline's layer
+    queries = points[sizes[0] :].copy()
+    queries[:, 3] -= layer_gap
+    # (the upper bound prunes the search; points without a match get an infinite distance)
+    dists, indices = tree.query(
+        queries, k=1, distance_upper_bound=merge_threshold, workers=-1
+    )
+
+    # Step 3: Keep close matches and make them relative to the previous scanline
+    previous_offsets = np.repeat(offsets[:-2], sizes[1:])
+    neighbors = np.where(np.isfinite(dists), indices - previous_offsets, -1)
+
+    return [first_neighbors] + np.split(neighbors, offsets[2:-1] - sizes[0])
+
+# %% ../nbs/01_gpf_slr.ipynb 17
+def _resolve_label(label: int, label_equivalences: dict) -> int:
+    """
+    Find the final label by following the equivalence chain, compressing the path on the way.
+
+    Args:
+        label (int): Label to resolve.
+        label_equivalences (dict): Dictionary of label equivalences, updated in place.
+
+    Returns:
+        int: Root label of the equivalence chain.
+    """
+    label = int(label)
+
+    # Step 1: Walk the chain up to the root label
+    root = label
+    while label_equivalences[root] != root:
+        root = label_equivalences[root]
+
+    # Step 2: Point every label on the chain directly at the root
+    while label_equivalences[label] != root:
+        next_label = label_equivalences[label]
+        label_equivalences[label] = root
+        label = next_label
+
+    return root
+
+# %% ../nbs/01_gpf_slr.ipynb 18
 def update_labels(
     runs_current: "list[np.ndarray]",
-    runs_above: "list[np.ndarray]",
+    labels_current: np.ndarray,
+    labels_above: np.ndarray,
+    neighbors_above: np.ndarray,
     label_equivalences: dict,
-    merge_threshold: float = 1.0,
-):
+    next_label: int,
+) -> int:
     """
-    Update labels of current scanline runs based on proximity to runs from previous scanline using KDTree.
+    Update labels of current scanline runs based on their nearest points in the previous scanline.
 
     Args:
-        runs_current (list[np.ndarray]): List of N x 6 arrays for current scanline runs.
-        runs_above (list[np.ndarray]): List of N x 6 arrays for previous scanline runs.
+        runs_current (list[np.ndarray]): List of index arrays for current scanline runs (see `find_runs`).
+        labels_current (np.ndarray): N array of labels of the current scanline, updated in place.
+        labels_above (np.ndarray): M array of labels of the previous scanline.
+        neighbors_above (np.ndarray): N array with the nearest point in the previous scanline of each point,
+                                      or -1 if none is close enough (see `find_scanline_neighbors`).
         label_equivalences (dict): Dictionary of label equivalences.
-        merge_threshold (float): Maximum distance to consider connection between runs.
-    """
+        next_label (int): Smallest label never assigned so far.
 
-    def resolve_label(label: int) -> int:
-        """Find the final label by following the equivalence chain."""
-        while label != label_equivalences[label]:
-            label = label_equivalences[label]
-        return label
+    Returns:
+        int: Next label to assign after this scanline.
+    """
 
     def assign_new_label(run, label_equivalences, global_label_counter):
-        while global_label_counter == 9 or global_label_counter in label_equivalences:
+        # labels are never freed and only move forward, so only the ground label needs skipping
+        if global_label_counter == 9:
             global_label_counter += 1
-        run[:, 4] = global_label_counter
+        labels_current[run] = global_label_counter
         label_equivalences[global_label_counter] = global_label_counter
         return global_label_counter + 1
 
     def inherit_and_unify_labels(run, neighbor_labels, label_equivalences):
+        # neighbor labels are roots: point all of them at the smallest one to keep chains shallow
         min_label = min(neighbor_labels)
-        run[:, 4] = min_label
+        labels_current[run] = min_label
         for lbl in neighbor_labels:
             label_equivalences[lbl] = min_label
 
-    global_label_counter = max(label_equivalences.values()) + 1
-
-    points_above = np.vstack(runs_above)
-    tree_above = KDTree(points_above[:, :3])  # use only x, y, z
+    global_label_counter = next_label
 
     for run in runs_current:
-        neighbor_labels = set()
-        dists, indices = tree_above.query(run[:, :3], k=1)
-        close_mask = dists[:, 0] < merge_threshold
-        close_indices = indices[close_mask, 0]
-        if close_indices.size > 0:
-            for idx in close_indices:
-                neighbor_label = points_above[idx, 4]
-                resolved_label = resolve_label(neighbor_label)
-                neighbor_labels.add(resolved_label)
+        neighbor_indices = neighbors_above[run]
+        close_indices = neighbor_indices[neighbor_indices >= 0]
+        # deduplicate in numpy first, so only a handful of labels go through the dictionary
+        raw_labels = np.unique(labels_above[close_indices])
+        neighbor_labels = {
+            _resolve_label(label, label_equivalences) for label in raw_labels
+        }
         if not neighbor_labels:
             global_label_counter = assign_new_label(
                 run, label_equivalences, global_label_counter
@@ -232,28 +424,60 @@ def update_labels(
         else:
             inherit_and_unify_labels(run, neighbor_labels, label_equivalences)
 
-# %% ../nbs/01_gpf_slr.ipynb 12
+    return global_label_counter
+
+# %% ../nbs/01_gpf_slr.ipynb 19
+@njit(cache=True)
+def _resolve_label_table(parents: np.ndarray) -> np.ndarray:
+    """
+    Resolve a label parent table to its roots, compressing paths in place (JIT-compiled).
+
+    Args:
+        parents (np.ndarray): L array where `parents[label]` is the label it is equivalent to.
+
+    Returns:
+        np.ndarray: The same array, with every entry pointing directly to its root label.
+    """
+    for label in range(parents.shape[0]):
+        # Step 1: Walk the chain up to the root label
+        root = label
+        while parents[root] != root:
+            root = parents[root]
+
+        # Step 2: Point every label on the chain directly at the root
+        while parents[label] != root:
+            next_label = parents[label]
+            parents[label] = root
+            label = next_label
+    return parents
+
+# %% ../nbs/01_gpf_slr.ipynb 20
 def extract_clusters(
-    scanlines: "list[np.ndarray]", label_equivalences: dict
+    labels_per_scanline: "list[np.ndarray]", label_equivalences: dict
 ) -> np.ndarray:
     """
-    Apply resolved labels to all points and return a unified point cloud.
+    Apply resolved labels to all points and return them as a single array.
 
     Args:
-        scanlines (list[np.ndarray]): List of N x 6 arrays for each scanline.
+        labels_per_scanline (list[np.ndarray]): List of label arrays, one for each scanline.
         label_equivalences (dict): Dictionary of final label equivalences.
 
     Returns:
-        np.ndarray: N x 6 array with updated labels in column 4.
+        np.ndarray: N array with the final label of every point, in scanline order.
     """
-    non_ground_points = np.vstack(scanlines)
+    labels = np.concatenate(labels_per_scanline)
 
-    for idx in range(0, len(non_ground_points)):
-        non_ground_points[idx][4] = label_equivalences[non_ground_points[idx][4]]
+    # Resolve every label once and build a lookup table (label -> final label)
+    keys = np.fromiter(label_equivalences.keys(), dtype=np.int64)
+    vals = np.fromiter(label_equivalences.values(), dtype=np.int64)
+    lut = np.arange(keys.max() + 1, dtype=np.int64)
+    lut[keys] = vals
+    lut = _resolve_label_table(lut)
 
-    return non_ground_points
+    # Remap all points in a single vectorized gather
+    return lut[labels]
 
-# %% ../nbs/01_gpf_slr.ipynb 13
+# %% ../nbs/01_gpf_slr.ipynb 21
 def scan_line_run_clustering(
     point_cloud: np.ndarray,
     distance_threshold: float = 0.5,
@@ -281,32 +505,45 @@ def scan_line_run_clustering(
     if non_ground_mask.sum() == 0:
         raise ValueError("point cloud já clusterizada")
     non_ground_indices = np.nonzero(non_ground_mask)[0]  # ← Adicionada
-    non_ground_points = point_cloud[non_ground_mask].copy()
+    non_ground_points = PointCloud.from_array(point_cloud, non_ground_indices)
 
-    if non_ground_points.size == 0:
+    if len(non_ground_points) == 0:
         raise ValueError("Point cloud already clustered or no non-ground points found.")
     # Group points into scanlines
-    scanlines = group_by_scanline(non_ground_points)
+    scanlines, scanline_order = group_by_scanline(non_ground_points)
+
+    # Labels are tracked in the int32 pred_label of each scanline (all 0 for non-ground points)
+    labels_per_scanline = [scanline.pred_label for scanline in scanlines]
+    xyz_per_scanline = [scanline.xyz for scanline in scanlines]
+
+    # Runs do not depend across scanlines: find them all before propagating labels
+    runs_per_scanline = [find_runs(xyz, distance_threshold) for xyz in xyz_per_scanline]
 
     # Initialize clustering with the first scanline
-    runs_above = find_runs(scanlines[0], distance_threshold)
-    for runs in runs_above:
+    for run in runs_per_scanline[0]:
         label_counter += 1
         if label_counter == 9:  # reserve label 9 for ground
             label_counter += 1
-        runs[:, 4] = label_counter
+        labels_per_scanline[0][run] = label_counter
         label_equivalences[label_counter] = label_counter
 
-    scanlines[0] = np.vstack(runs_above)
+    # Nearest neighbors between consecutive scanlines do not depend on labels: find them all at once
+    neighbors_per_scanline = find_scanline_neighbors(xyz_per_scanline, merge_threshold)
 
     # Propagate labels through remaining scanlines
+    next_label = label_counter + 1
     for i in range(1, len(scanlines)):
-        runs_current = find_runs(scanlines[i], distance_threshold)
-        update_labels(runs_current, runs_above, label_equivalences, merge_threshold)
-
-        scanlines[i] = np.vstack(runs_current)
-        runs_above = runs_current
-
-    clustered_points = extract_clusters(scanlines, label_equivalences)
-    point_cloud[non_ground_indices, 4] = clustered_points[:, 4]
+        next_label = update_labels(
+            runs_per_scanline[i],
+            labels_per_scanline[i],
+            labels_per_scanline[i - 1],
+            neighbors_per_scanline[i],
+            label_equivalences,
+            next_label,
+        )
+
+    # Labels come out in scanline order, so map them back through the grouping permutation
+    point_cloud[non_ground_indices[scanline_order], 4] = extract_clusters(
+        labels_per_scanline, label_equivalences
+    )
     return point_cloud